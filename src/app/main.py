@@ -1,14 +1,115 @@
 """Main module for FastAPI app."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from typing import Optional
 
+import numpy as np
+import orjson
 import uvicorn
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 
 from openwx import grib
-from openwx.gfs import GFSParameters, get_hours_from_range, get_parameter_value
+from openwx.gfs import (
+    GFSParameters,
+    clear_cache,
+    get_forecast_hours,
+    get_hours_from_range,
+    get_parameter_values,
+    to_naive_utc,
+)
 from openwx.models import Coords, Forecast, ForecastResponseModel
 
-app = FastAPI()
+OPENDAP_MAX_WORKERS = 16
+# Each forecast hour fetches an idx file and one GRIB message per parameter.
+GRIB_MAX_CONCURRENT_FORECASTS = 8
+# GFS runs every 6 hours, so cached OPeNDAP datasets and point values are dropped on
+# the same cadence.
+GFS_CACHE_CLEAR_INTERVAL = 6 * 60 * 60
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Blocking OPeNDAP reads run here so they don't stall the event loop.
+_executor = ThreadPoolExecutor(max_workers=OPENDAP_MAX_WORKERS)
+_cache_clear_task: Optional["asyncio.Task[None]"] = None
+
+_VALID_PARAMETER_SET = frozenset(GFSParameters.parameter_names())
+_PARAMETER_INFO_JSON = orjson.dumps(
+    [
+        {"parameter": parameter.short_name, "unit": parameter.model_unit}
+        for parameter in GFSParameters.parameters()
+    ]
+)
+
+
+def _validate_parameters(parameters: list[str]) -> None:
+    """Raises an HTTP 400 error if any of the requested parameters are unknown.
+
+    Args:
+        parameters (list[str]): The requested parameters.
+
+    Raises:
+        HTTPException: If any requested parameter is not a valid parameter name.
+    """
+    invalid_params = [
+        param for param in parameters if param not in _VALID_PARAMETER_SET
+    ]
+    if len(invalid_params) > 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The following parameter entries were invalid: {invalid_params}",
+        )
+
+
+async def _get_grib_forecast(
+    semaphore: asyncio.Semaphore,
+    run: datetime,
+    forecast: int,
+    requests: list[tuple[str, str]],
+    coords: Coords,
+) -> list[Optional[np.ndarray]]:
+    """Returns GRIB values for one forecast hour, limited by a shared semaphore.
+
+    Args:
+        semaphore (asyncio.Semaphore): Limits how many forecast hours run at once.
+        run (datetime): The model run.
+        forecast (int): The forecast hour.
+        requests (list[tuple[str, str]]): The requested (parameter, level) pairs.
+        coords (Coords): The requested location.
+
+    Returns:
+        list[Optional[np.ndarray]]: The values for each request, or None for any that
+            couldn't be fetched or decoded.
+    """
+    async with semaphore:
+        return await grib.get_forecast_values(
+            run=run, forecast=forecast, requests=requests, coords=[coords]
+        )
+
+
+async def _clear_cache_periodically() -> None:
+    """Clears cached GFS datasets and point values every GFS_CACHE_CLEAR_INTERVAL."""
+    while True:
+        await asyncio.sleep(GFS_CACHE_CLEAR_INTERVAL)
+        clear_cache()
+
+
+@app.on_event("startup")
+async def startup() -> None:
+    """Schedules periodic clearing of the GFS caches."""
+    global _cache_clear_task
+    _cache_clear_task = asyncio.create_task(_clear_cache_periodically())
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """Stops cache clearing and releases the OPeNDAP pool and GRIB HTTP session."""
+    if _cache_clear_task is not None:
+        _cache_clear_task.cancel()
+    _executor.shutdown(wait=False)
+    await grib.close_session()
 
 
 @app.get("/")
@@ -22,19 +123,15 @@ async def root() -> dict[str, str]:
 
 
 @app.get("/parameterInfo")
-async def parameter_info() -> list[dict[str, str]]:
+async def parameter_info() -> Response:
     """Returns a list of available parameters and their associated metadata.
 
+    The parameter list is fixed at runtime, so the response body is serialized once.
+
     Returns:
-        list[dict[str, str]]: A list of available parameters and their associated metadata.
+        Response: A JSON list of available parameters and their associated metadata.
     """
-    response = []
-    for parameter in GFSParameters.parameters():
-        response.append(
-            {"parameter": parameter.short_name, "unit": parameter.model_unit}
-        )
-
-    return response
+    return Response(content=_PARAMETER_INFO_JSON, media_type="application/json")
 
 
 @app.get("/queryParameters", response_model=ForecastResponseModel)
@@ -57,31 +154,30 @@ async def query_parameters(
     Returns:
         ForecastResponseModel: The response model for the selected parameter data.
     """
-    valid_parameters = list(GFSParameters.parameter_names())
-    invalid_params = [param for param in parameters if param not in valid_parameters]
-    if len(invalid_params) > 0:
-        raise HTTPException(
-            status_code=400,
-            detail=f"The following parameter entries were invalid: {invalid_params}",
-        )
-    response_forecasts = []
-    response_parameters = {}
+    _validate_parameters(parameters)
     valid_times = get_hours_from_range(
         start_time=valid_time_start, end_time=valid_time_end
     )
-    for valid_time in valid_times:
-        for parameter in parameters:
-            param_value = get_parameter_value(
-                coords=coords,
-                parameter=parameter,
-                valid_time=valid_time,
-                model_run=model_run,
-            )
-            response_parameters[parameter] = param_value.tolist()
-
-        response_forecasts.append(
-            Forecast(valid_time=valid_time, parameters=response_parameters)
+    param_values = await asyncio.get_running_loop().run_in_executor(
+        _executor,
+        partial(
+            get_parameter_values,
+            parameters=parameters,
+            coords=coords,
+            valid_times=valid_times,
+            model_run=model_run,
+        ),
+    )
+    response_forecasts = [
+        Forecast(
+            valid_time=valid_time,
+            parameters={
+                parameter: float(values[time_index])
+                for parameter, values in param_values.items()
+            },
         )
+        for time_index, valid_time in enumerate(valid_times)
+    ]
 
     response = ForecastResponseModel(
         lat=coords.latitude, lon=coords.longitude, forecasts=response_forecasts
@@ -107,38 +203,61 @@ async def query_grib_parameters(
         coords (Coords, optional): The coordinates for the request.
         parameters (list[str], optional): The requested parameters.
 
+    Raises:
+        HTTPException: If a valid time is before the run or not on the hour.
+
     Returns:
         ForecastResponseModel: The response model for the selected parameter data.
     """
-    valid_parameters = list(GFSParameters.parameter_names())
-    invalid_params = [param for param in parameters if param not in valid_parameters]
-    if len(invalid_params) > 0:
-        raise HTTPException(
-            status_code=400,
-            detail=f"The following parameter entries were invalid: {invalid_params}",
-        )
-    response_forecasts = []
-    response_parameters = {}
+    _validate_parameters(parameters)
+    # Compare all three times in UTC, whether or not the request gave a timezone.
+    run = to_naive_utc(run)
     valid_times = get_hours_from_range(
-        start_time=valid_time_start, end_time=valid_time_end
+        start_time=to_naive_utc(valid_time_start),
+        end_time=to_naive_utc(valid_time_end),
     )
-    for valid_time in valid_times:
-        forecast = (valid_time - run).seconds // 3600
-        for parameter in parameters:
-            if grib_param := GFSParameters.from_string(parameter):
-                param_value = grib.get_parameter_value(
-                    run=run,
-                    coords=coords,
-                    level="2 m above ground",
-                    parameter=grib_param.grib_index_key,
-                    forecast=forecast,
-                )
-                response_parameters[parameter] = await param_value
+    try:
+        forecast_hours = get_forecast_hours(run=run, valid_times=valid_times)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    forecasts = [int(forecast) for forecast in forecast_hours]
+    # Fetch every idx file in one batch up front, and skip the forecast hours that
+    # don't have one.
+    indices = await grib.get_parsed_grib_indices(run=run, forecasts=forecasts)
+    available = [
+        forecast for forecast, index in zip(forecasts, indices) if index is not None
+    ]
+    requests = [(parameter, "2 m above ground") for parameter in parameters]
+    semaphore = asyncio.Semaphore(GRIB_MAX_CONCURRENT_FORECASTS)
+    forecast_values = await asyncio.gather(
+        *[
+            _get_grib_forecast(
+                semaphore=semaphore,
+                run=run,
+                forecast=forecast,
+                requests=requests,
+                coords=coords,
+            )
+            for forecast in available
+        ]
+    )
+    values_by_forecast = dict(zip(available, forecast_values))
 
-        print(valid_time, response_parameters)
-        response_forecasts.append(
-            Forecast(valid_time=valid_time, parameters=response_parameters)
+    # Values that couldn't be fetched, e.g. for a missing forecast hour, are omitted.
+    missing: list[Optional[np.ndarray]] = [None] * len(requests)
+    response_forecasts = [
+        Forecast(
+            valid_time=valid_time,
+            parameters={
+                parameter: float(param_value[0])
+                for parameter, param_value in zip(
+                    parameters, values_by_forecast.get(forecast, missing)
+                )
+                if param_value is not None
+            },
         )
+        for valid_time, forecast in zip(valid_times, forecasts)
+    ]
 
     response = ForecastResponseModel(
         lat=coords.latitude, lon=coords.longitude, forecasts=response_forecasts
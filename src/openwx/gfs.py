@@ -1,19 +1,30 @@
 """The module response for configuration and querying of GFS data."""
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Generator, Iterable, Optional
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import ClassVar, Dict, Generator, Iterable, List, Optional, Tuple
 
 import numpy as np
+import pandas as pd
 import xarray as xr
-from xarray.core.types import InterpOptions
 
 from openwx.models import Coords
 
+COORD_CACHE_PRECISION = 0.01
 
-@dataclass
+
+@dataclass(frozen=True)
 class ParameterMetadata:
     """A dataclass for storing parameter metadata."""
 
+    __slots__ = (
+        "short_name",
+        "nc_dataset_key",
+        "grib_index_key",
+        "grib_dataset_key",
+        "model_unit",
+    )
+
     short_name: str
     nc_dataset_key: str
     grib_index_key: str
@@ -46,6 +57,14 @@ class GFSParameters:
         grib_dataset_key="gust",
         model_unit="m/s",
     )
+    _parameters: ClassVar[Tuple[ParameterMetadata, ...]] = (
+        temperature_2m,
+        relative_humidty_2m,
+        gust_surface,
+    )
+    _by_name: ClassVar[Dict[str, ParameterMetadata]] = {
+        parameter.short_name: parameter for parameter in _parameters
+    }
 
     @classmethod
     def from_string(cls, parameter_name: str) -> Optional[ParameterMetadata]:
@@ -57,11 +76,7 @@ class GFSParameters:
         Returns:
             Optional[ParameterMetadata]: The matching ParameterData object, otherwise None.
         """
-        for parameter in cls.parameters():
-            if parameter_name == parameter.short_name:
-                return parameter
-        else:
-            return None
+        return cls._by_name.get(parameter_name)
 
     @classmethod
     def parameter_names(cls) -> Generator[str, None, None]:
@@ -70,8 +85,7 @@ class GFSParameters:
         Yields:
             Generator[str, None, None]: A generator of parameter short names.
         """
-        for parameter in cls.parameters():
-            yield parameter.short_name
+        yield from cls._by_name
 
     @classmethod
     def parameters(cls) -> Generator[ParameterMetadata, None, None]:
@@ -80,9 +94,7 @@ class GFSParameters:
         Yields:
             Generator[str, None, None]: A genrator of parameter names.
         """
-        for attr in vars(cls).values():
-            if isinstance(attr, ParameterMetadata):
-                yield attr
+        yield from cls._parameters
 
     @classmethod
     def get_grib_index_key(cls, parameter: str) -> Optional[str]:
@@ -130,9 +142,35 @@ def get_nc_dataset_key(parameter: str) -> Optional[str]:
         return None
 
 
+def normalize_lon(lon: float) -> float:
+    """Wraps a longitude into the [0, 360) range used by GFS grids.
+
+    Args:
+        lon (float): A longitude in degrees east, e.g. -95.94 or 264.06.
+
+    Returns:
+        float: The equivalent longitude between 0 and 360 degrees.
+    """
+    return lon % 360.0
+
+
+def to_naive_utc(time: datetime) -> datetime:
+    """Converts a datetime to naive UTC, the time base of GFS model runs.
+
+    Args:
+        time (datetime): A naive datetime, taken to be UTC, or a timezone-aware one.
+
+    Returns:
+        datetime: The equivalent naive UTC datetime.
+    """
+    if time.tzinfo is None:
+        return time
+    return time.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 def get_hours_from_range(
     start_time: datetime, end_time: datetime, interval: int = 1
-) -> Iterable[datetime]:
+) -> pd.DatetimeIndex:
     """Generates datetimes for each hour at the requested interval between two dates.
 
     Args:
@@ -141,54 +179,189 @@ def get_hours_from_range(
         interval (int, optional): The number of hours between each interval. Defaults to 1.
 
     Returns:
-        Iterable[datetime]: An itterable of datetime objects at the requested interval.
+        pd.DatetimeIndex: Datetimes at the requested interval, including the end time.
+    """
+    return pd.date_range(
+        start=start_time, end=end_time, freq=pd.Timedelta(hours=interval)
+    )
+
+
+def get_forecast_hours(run: datetime, valid_times: pd.DatetimeIndex) -> np.ndarray:
+    """Returns the forecast hour of each valid time relative to a model run.
+
+    Args:
+        run (datetime): The model run date and hour.
+        valid_times (pd.DatetimeIndex): The valid times.
 
-    Yields:
-        Iterator[Iterable[datetime]]: Datetime objects at the requested interval.
+    Raises:
+        ValueError: If a valid time is before the run or not a whole number of hours
+            after it.
+
+    Returns:
+        np.ndarray: The number of hours between the run and each valid time.
     """
-    increment_time = start_time
-    while increment_time <= end_time:
-        yield increment_time
-        increment_time += timedelta(hours=interval)
+    offsets = valid_times - pd.Timestamp(run)
+    hour = pd.Timedelta(hours=1)
+    if (offsets < pd.Timedelta(0)).any():
+        raise ValueError("Valid times must not be before the model run.")
+    if (offsets % hour != pd.Timedelta(0)).any():
+        raise ValueError("Valid times must be a whole number of hours after the run.")
+    return (offsets // hour).to_numpy()
 
 
-def get_parameter_value(
-    parameter: str,
-    coords: Coords,
-    valid_time: datetime,
-    model_run: datetime,
-    interp_method: InterpOptions = "linear",
-    selection_method: str = "nearest",
-) -> np.ndarray:
-    """Returns the value of a specific weather parameter at a provided location and time.
+@lru_cache(maxsize=8)
+def _open_gfs(model_date: str, model_hour: str) -> xr.Dataset:
+    """Opens the GFS OPeNDAP dataset for a model run, reusing recently opened runs.
+
+    Call `_open_gfs.cache_clear()` to force the datasets to be reopened.
 
     Args:
-        parameter (Parameter): The requested weather parameter.
-        coords (Coords): The requested location.
-        valid_time (datetime): The requested time.
-        method (InterpOptions, optional): Method to use for Interpolation. Defaults to "linear".
+        model_date (str): The model run date formatted as YYYYMMDD.
+        model_hour (str): The model run hour formatted as HH.
 
     Returns:
-        ArrayLike: The value of the requested weather parameter
+        xr.Dataset: The lazily loaded GFS dataset.
     """
-    model_date = model_run.strftime("%Y%m%d")
-    model_hour = model_run.strftime("%H")
     base_url = "http://nomads.ncep.noaa.gov:80"
     gfs_link = (
         f"{base_url}/dods/gfs_0p25_1hr/gfs{model_date}/gfs_0p25_1hr_{model_hour}z"
     )
-    ds = xr.open_dataset(gfs_link, use_cftime=True)
+    ds = xr.open_dataset(gfs_link)
+    # NOMADS encodes time as days since 0001-01-01, which pandas cannot use as a
+    # reference date. If xarray falls back to cftime, convert back to datetime64 so
+    # time selection stays a searchsorted over int64.
+    if isinstance(ds.indexes["time"], xr.CFTimeIndex):
+        ds["time"] = ds.indexes["time"].to_datetimeindex()
+    return ds
+
 
-    param_key = get_nc_dataset_key(parameter=parameter)
+def _bilinear_weights(
+    latitude: float, longitude: float, lats: np.ndarray, lons: np.ndarray
+) -> Tuple[int, List[int], np.ndarray]:
+    """Returns the surrounding grid indices and bilinear weights for a point.
 
-    value = (
-        ds[param_key]
-        .sel(time=valid_time, method=selection_method)
-        .interp(lat=coords.latitude, lon=coords.longitude, method=interp_method)
-        .data
+    Longitudes are treated as periodic so points east of the last grid column are
+    interpolated against the first.
+
+    Args:
+        latitude (float): The requested latitude.
+        longitude (float): The requested longitude.
+        lats (np.ndarray): The ascending, evenly spaced grid latitudes.
+        lons (np.ndarray): The ascending, evenly spaced grid longitudes.
+
+    Returns:
+        Tuple[int, List[int], np.ndarray]: The lower latitude index, the two longitude
+            indices, and a 2x2 array of weights ordered [lat, lon].
+    """
+    lat_pos = (latitude - lats[0]) / (lats[1] - lats[0])
+    ilat = int(np.clip(np.floor(lat_pos), 0, len(lats) - 2))
+    lat_frac = lat_pos - ilat
+
+    lon_pos = (longitude - lons[0]) / (lons[1] - lons[0])
+    jlon = int(np.floor(lon_pos))
+    lon_frac = lon_pos - jlon
+    jlons = [jlon % len(lons), (jlon + 1) % len(lons)]
+
+    weights = np.outer([1 - lat_frac, lat_frac], [1 - lon_frac, lon_frac])
+    return ilat, jlons, weights
+
+
+@lru_cache(maxsize=4096)
+def _get_point_values(
+    model_run: datetime,
+    param_keys: Tuple[str, ...],
+    lat_key: int,
+    lon_key: int,
+    valid_times: Tuple[datetime, ...],
+    selection_method: str,
+) -> Dict[str, np.ndarray]:
+    """Returns dataset values at a point, reusing results for recently requested points.
+
+    Args:
+        model_run (datetime): The requested model run.
+        param_keys (Tuple[str, ...]): The dataset keys of the requested parameters.
+        lat_key (int): The requested latitude in units of COORD_CACHE_PRECISION.
+        lon_key (int): The requested longitude in units of COORD_CACHE_PRECISION.
+        valid_times (Tuple[datetime, ...]): The requested times.
+        selection_method (str): Method to use for time selection.
+
+    Returns:
+        Dict[str, np.ndarray]: Read-only values for each dataset key, one per valid time.
+    """
+    ds = _open_gfs(
+        model_date=model_run.strftime("%Y%m%d"), model_hour=model_run.strftime("%H")
+    )
+    ilat, jlons, weights = _bilinear_weights(
+        latitude=lat_key * COORD_CACHE_PRECISION,
+        longitude=lon_key * COORD_CACHE_PRECISION,
+        lats=ds["lat"].values,
+        lons=ds["lon"].values,
+    )
+
+    # Only the grid cell surrounding the point is pulled over OPeNDAP, and the same
+    # weights are applied to every parameter and time.
+    corners = (
+        ds[list(param_keys)]
+        .isel(lat=[ilat, ilat + 1], lon=jlons)
+        .sel(time=list(valid_times), method=selection_method)
     )
 
-    return value
+    values = {}
+    for param_key in param_keys:
+        values[param_key] = np.einsum(
+            "ij,tij->t",
+            weights,
+            corners[param_key].transpose("time", "lat", "lon").values,
+        )
+        values[param_key].flags.writeable = False
+    return values
+
+
+def get_parameter_values(
+    parameters: Iterable[str],
+    coords: Coords,
+    valid_times: Iterable[datetime],
+    model_run: datetime,
+    selection_method: str = "nearest",
+) -> Dict[str, np.ndarray]:
+    """Returns the values of weather parameters at a provided location and set of times.
+
+    All parameters and times are selected from the dataset in a single vectorized call
+    and bilinearly interpolated to the requested location. Coordinates are rounded to
+    COORD_CACHE_PRECISION so repeated requests for the same location and model run are
+    served from memory.
+
+    Args:
+        parameters (Iterable[str]): The requested weather parameters.
+        coords (Coords): The requested location.
+        valid_times (Iterable[datetime]): The requested times.
+        model_run (datetime): The requested model run.
+        selection_method (str, optional): Method to use for time selection. Defaults to "nearest".
+
+    Returns:
+        Dict[str, np.ndarray]: The values of each requested parameter, one per valid time.
+    """
+    param_keys = {}
+    for parameter in parameters:
+        if param_key := get_nc_dataset_key(parameter=parameter):
+            param_keys[parameter] = param_key
+
+    values = _get_point_values(
+        model_run=model_run,
+        param_keys=tuple(sorted(set(param_keys.values()))),
+        lat_key=round(coords.latitude / COORD_CACHE_PRECISION),
+        lon_key=round(normalize_lon(coords.longitude) / COORD_CACHE_PRECISION),
+        valid_times=tuple(valid_times),
+        selection_method=selection_method,
+    )
+
+    return {parameter: values[param_key] for parameter, param_key in param_keys.items()}
+
+
+def clear_cache() -> None:
+    """Clears cached datasets and point values, e.g. when a model run is updated."""
+    _open_gfs.cache_clear()
+    _get_point_values.cache_clear()
 
 
 def main() -> None:
@@ -1,22 +1,109 @@
 """Module for handling data retrieval from grib source data."""
 import asyncio
+import json
 import logging
+import os
+import re
+import time
 from datetime import datetime
+from functools import lru_cache
 from tempfile import NamedTemporaryFile
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Coroutine,
+    Dict,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import aiohttp
 import numpy as np
 import xarray as xr
-from xarray.core.types import InterpOptions
+from numpy.typing import ArrayLike
+from scipy.ndimage import map_coordinates, spline_filter1d
 
-from openwx.gfs import GFSParameters
+from openwx.gfs import GFSParameters, normalize_lon
 from openwx.models import Coords
 
 BASE_URL = "https://noaa-gfs-bdp-pds.s3.amazonaws.com"
-URL_PATTERN = "/gfs.{run_date}/{run_hour:02d}/atmos/gfs.t{run_hour:02d}z.pgrb2.0p25.f{forecast:03d}"
+# Enough for every forecast hour of the last few runs.
+URL_CACHE_SIZE = 1024
+# Messages larger than this are fetched as concurrent range requests of this size.
+RANGE_PART_SIZE = 8 * 1024 * 1024
+# A shorter first part is merged into the next one. It must at least hold GRIB_MAGIC.
+RANGE_PART_MIN_SIZE = 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+GRIB_MAGIC = b"GRIB"
+GRIB_END = b"7777"
+GRIB_INDEX_TTL = 600
+# Parsed idx files are shared across processes on disk, keyed by the idx ETag.
+GRIB_INDEX_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "openwx"
+)
+GRIB_INDEX_CACHE_MAX_FILES = 512
+# tmpfs keeps staged GRIB messages off disk. NamedTemporaryFile still creates
+# private, uniquely named files there.
+GRIB_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None  # noqa: S108
 
+InterpMethod = Literal["nearest", "linear", "cubic"]
+INTERP_ORDERS: Dict[str, int] = {"nearest": 0, "linear": 1, "cubic": 3}
 
+
+class ByteRange(NamedTuple):
+    """Inclusive byte range of a GRIB message; stop is None for the last message."""
+
+    start: int
+    stop: Optional[int]
+
+
+ParsedGribIndex = Dict[Tuple[str, str], ByteRange]
+
+_GRIB_INDEX_KEYS: Dict[str, str] = {
+    parameter.short_name: parameter.grib_index_key
+    for parameter in GFSParameters.parameters()
+}
+_GRIB_DATASET_KEYS: Dict[str, str] = {
+    parameter.short_name: parameter.grib_dataset_key
+    for parameter in GFSParameters.parameters()
+}
+
+_session: Optional[aiohttp.ClientSession] = None
+_parsed_index_cache: Dict[
+    Tuple[datetime, int], Tuple[float, "asyncio.Task[ParsedGribIndex]"]
+] = {}
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Returns the shared client session, creating it on first use.
+
+    Returns:
+        aiohttp.ClientSession: A client session with a pooled, keep-alive connector
+            that raises on HTTP error statuses.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=75
+            ),
+            raise_for_status=True,
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Closes the shared client session if one has been opened."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def get_grib_url(run: datetime, forecast: int) -> str:
     """Returns a formatted grib URL string from run and forecast.
 
@@ -27,11 +114,12 @@ def get_grib_url(run: datetime, forecast: int) -> str:
     Returns:
         str: A formatted URL for the model run and forecast.
     """
-    return BASE_URL + URL_PATTERN.format(
-        run_date=run.strftime("%Y%m%d"), run_hour=run.hour, forecast=forecast
-    )
+    run_date = f"{run.year:04d}{run.month:02d}{run.day:02d}"
+    hour = run.hour
+    return f"{BASE_URL}/gfs.{run_date}/{hour:02d}/atmos/gfs.t{hour:02d}z.pgrb2.0p25.f{forecast:03d}"
 
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def get_grib_idx_url(run: datetime, forecast: int) -> str:
     """Returns a formatted idx URL string from run and forecast.
 
@@ -55,15 +143,376 @@ async def get_grib_index(run: datetime, forecast: int) -> str:
     Returns:
         str: Contents of the idx file.
     """
-    async with aiohttp.ClientSession() as session:
-        url = get_grib_idx_url(run=run, forecast=forecast)
-        logging.info("Requesting %s", url)
-        async with session.get(url) as response:
-            resp_text = await response.text()
+    session = await _get_session()
+    url = get_grib_idx_url(run=run, forecast=forecast)
+    logging.info("Requesting %s", url)
+    async with session.get(url) as response:
+        resp_text = await response.text()
 
     return resp_text
 
 
+async def get_grib_index_etag(run: datetime, forecast: int) -> Optional[str]:
+    """Fetches the ETag of the grib idx file for the specified run and forecast.
+
+    Args:
+        run (datetime): The desired model run date and time.
+        forecast (int): The forecast hour.
+
+    Returns:
+        Optional[str]: The ETag of the idx file, if the server provides one.
+    """
+    session = await _get_session()
+    async with session.head(get_grib_idx_url(run=run, forecast=forecast)) as response:
+        return response.headers.get("ETag")
+
+
+def _get_index_cache_path(etag: str) -> Optional[str]:
+    """Returns the on-disk cache path for a parsed idx file with the given ETag.
+
+    Args:
+        etag (str): The ETag of the idx file.
+
+    Returns:
+        Optional[str]: The cache file path, or None if the ETag has no usable characters.
+    """
+    name = re.sub(r"[^0-9A-Za-z-]", "", etag)
+    return os.path.join(GRIB_INDEX_CACHE_DIR, f"{name}.json") if name else None
+
+
+def _load_cached_index(path: str) -> Optional[ParsedGribIndex]:
+    """Loads a parsed idx file from the on-disk cache.
+
+    Args:
+        path (str): The cache file path.
+
+    Returns:
+        Optional[ParsedGribIndex]: The parsed idx file, or None if it isn't cached.
+    """
+    try:
+        with open(path, "rb") as cache_file:
+            parsed_index = {
+                (parameter, level): ByteRange(start, stop)
+                for parameter, level, start, stop in json.loads(cache_file.read())
+            }
+        # Touch the file so eviction drops the least recently used entries.
+        os.utime(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return parsed_index
+
+
+def _store_cached_index(path: str, parsed_index: ParsedGribIndex) -> None:
+    """Atomically writes a parsed idx file to the on-disk cache and evicts old entries.
+
+    Args:
+        path (str): The cache file path.
+        parsed_index (ParsedGribIndex): The parsed idx file.
+    """
+    try:
+        os.makedirs(GRIB_INDEX_CACHE_DIR, exist_ok=True)
+        with NamedTemporaryFile(
+            "w", dir=GRIB_INDEX_CACHE_DIR, suffix=".tmp", delete=False
+        ) as temp_file:
+            # JSON has no tuple keys, so store one row per parameter and level.
+            json.dump(
+                [[*key, *byte_range] for key, byte_range in parsed_index.items()],
+                temp_file,
+            )
+        os.replace(temp_file.name, path)
+
+        with os.scandir(GRIB_INDEX_CACHE_DIR) as entries:
+            cached = [entry for entry in entries if entry.name.endswith(".json")]
+        if len(cached) > GRIB_INDEX_CACHE_MAX_FILES:
+            cached.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+            for entry in cached[GRIB_INDEX_CACHE_MAX_FILES:]:
+                os.remove(entry.path)
+    except OSError:
+        logging.warning("Unable to cache parsed idx file at %s", path, exc_info=True)
+
+
+async def _get_etag_cache_path(run: datetime, forecast: int) -> Optional[str]:
+    """Returns the on-disk cache path for the idx file of a run and forecast.
+
+    Looking up the ETag costs a HEAD request; if it fails in transport, None is
+    returned and the idx file is fetched without the cache.
+
+    Args:
+        run (datetime): The desired model run date and time.
+        forecast (int): The forecast hour.
+
+    Raises:
+        aiohttp.ClientResponseError: If the idx file doesn't exist.
+
+    Returns:
+        Optional[str]: The cache file path, or None if the idx file can't be cached.
+    """
+    try:
+        etag = await get_grib_index_etag(run=run, forecast=forecast)
+    except aiohttp.ClientResponseError as error:
+        # A missing forecast hour would 404 on the GET as well, so fail it now.
+        if error.status == 404:
+            raise
+        logging.warning("Unable to get ETag for idx file: %r", error)
+        return None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        logging.warning("Unable to get ETag for idx file: %r", error)
+        return None
+    return _get_index_cache_path(etag) if etag else None
+
+
+async def _load_parsed_grib_index(
+    run: datetime, forecast: int
+) -> Tuple[Optional[str], Optional[ParsedGribIndex]]:
+    """Looks up the parsed grib idx file for a run and forecast in the on-disk cache.
+
+    Args:
+        run (datetime): The desired model run date and time.
+        forecast (int): The forecast hour.
+
+    Returns:
+        Tuple[Optional[str], Optional[ParsedGribIndex]]: The cache file path, or None
+            if the idx file can't be cached, and the parsed index if it was cached.
+    """
+    path = await _get_etag_cache_path(run=run, forecast=forecast)
+    if path is None:
+        return None, None
+    # Cache files are read and written in a worker thread to keep disk I/O off the
+    # event loop.
+    loop = asyncio.get_running_loop()
+    return path, await loop.run_in_executor(None, _load_cached_index, path)
+
+
+async def _fetch_parsed_grib_index(run: datetime, forecast: int) -> ParsedGribIndex:
+    """Fetches and parses the grib idx file for the specified run and forecast.
+
+    The parsed index is read from the on-disk cache when an entry matching the idx
+    file's ETag exists, and written to it otherwise.
+
+    Args:
+        run (datetime): The desired model run date and time.
+        forecast (int): The forecast hour.
+
+    Raises:
+        aiohttp.ClientResponseError: If the idx file doesn't exist.
+
+    Returns:
+        ParsedGribIndex: The parsed contents of the idx file.
+    """
+    path, parsed_index = await _load_parsed_grib_index(run=run, forecast=forecast)
+    if parsed_index is None:
+        parsed_index = parse_grib_index(
+            await get_grib_index(run=run, forecast=forecast)
+        )
+        if path is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, _store_cached_index, path, parsed_index
+            )
+    return parsed_index
+
+
+async def _fetch_parsed_grib_indices(
+    run: datetime, forecasts: List[int]
+) -> List[Union[ParsedGribIndex, BaseException]]:
+    """Fetches and parses the grib idx files for several forecasts of a model run.
+
+    Indices found in the on-disk cache are reused. The rest are downloaded
+    concurrently, parsed in worker threads, and written to the cache.
+
+    Args:
+        run (datetime): The desired model run date and time.
+        forecasts (List[int]): The forecast hours.
+
+    Returns:
+        List[Union[ParsedGribIndex, BaseException]]: The parsed contents of each idx
+            file, or the error raised while fetching it, in order.
+    """
+    loop = asyncio.get_running_loop()
+    lookups = await asyncio.gather(
+        *[
+            _load_parsed_grib_index(run=run, forecast=forecast)
+            for forecast in forecasts
+        ],
+        return_exceptions=True,
+    )
+    results: List[Union[ParsedGribIndex, BaseException, None]] = [
+        lookup if isinstance(lookup, BaseException) else lookup[1] for lookup in lookups
+    ]
+
+    uncached = [position for position, result in enumerate(results) if result is None]
+    downloads = await asyncio.gather(
+        *[
+            get_grib_index(run=run, forecast=forecasts[position])
+            for position in uncached
+        ],
+        return_exceptions=True,
+    )
+    downloaded: List[Tuple[int, str]] = []
+    for position, download in zip(uncached, downloads):
+        if isinstance(download, BaseException):
+            results[position] = download
+        else:
+            downloaded.append((position, download))
+
+    # Each file is parsed on its own, so a malformed one only fails its own forecast.
+    parsed_indices = await asyncio.gather(
+        *[
+            loop.run_in_executor(None, parse_grib_index, index)
+            for _, index in downloaded
+        ],
+        return_exceptions=True,
+    )
+    stores = []
+    for (position, _), parsed_index in zip(downloaded, parsed_indices):
+        results[position] = parsed_index
+        path = lookups[position][0]
+        if path is not None and not isinstance(parsed_index, BaseException):
+            stores.append(
+                loop.run_in_executor(None, _store_cached_index, path, parsed_index)
+            )
+    await asyncio.gather(*stores)
+    return results
+
+
+async def _select_parsed_grib_index(
+    bulk: "asyncio.Future[List[Union[ParsedGribIndex, BaseException]]]",
+    position: int,
+) -> ParsedGribIndex:
+    """Returns one parsed index from a bulk fetch, raising its error if it failed.
+
+    Args:
+        bulk (asyncio.Future[List[Union[ParsedGribIndex, BaseException]]]): The bulk
+            fetch of several idx files.
+        position (int): The position of the idx file in the bulk fetch.
+
+    Returns:
+        ParsedGribIndex: The parsed contents of the idx file.
+    """
+    # Shield the bulk fetch so one cancelled forecast doesn't cancel the others.
+    result = (await asyncio.shield(bulk))[position]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def _evict_expired_indices(now: float) -> None:
+    """Drops parsed idx cache entries that expired at or before now.
+
+    Args:
+        now (float): The current time.monotonic() value.
+    """
+    for key in [
+        key for key, (expiry, _) in _parsed_index_cache.items() if expiry <= now
+    ]:
+        del _parsed_index_cache[key]
+
+
+def _cache_parsed_index_task(
+    cache_key: Tuple[datetime, int],
+    coroutine: Coroutine[Any, Any, ParsedGribIndex],
+) -> "asyncio.Task[ParsedGribIndex]":
+    """Schedules a parsed idx fetch and caches its task for GRIB_INDEX_TTL seconds.
+
+    The entry is dropped as soon as the task fails, so the next caller retries.
+
+    Args:
+        cache_key (Tuple[datetime, int]): The run and forecast of the idx file.
+        coroutine (Coroutine[Any, Any, ParsedGribIndex]): Fetches the parsed idx file.
+
+    Returns:
+        asyncio.Task[ParsedGribIndex]: The scheduled task.
+    """
+    task = asyncio.ensure_future(coroutine)
+    new_entry = (time.monotonic() + GRIB_INDEX_TTL, task)
+    _parsed_index_cache[cache_key] = new_entry
+
+    def evict_failed(done: "asyncio.Task[ParsedGribIndex]") -> None:
+        if done.cancelled() or done.exception() is not None:
+            if _parsed_index_cache.get(cache_key) is new_entry:
+                del _parsed_index_cache[cache_key]
+
+    task.add_done_callback(evict_failed)
+    return task
+
+
+async def get_parsed_grib_index(run: datetime, forecast: int) -> ParsedGribIndex:
+    """Returns the parsed grib idx file for the specified run and forecast.
+
+    Parsed indices are cached for GRIB_INDEX_TTL seconds, and concurrent callers for
+    the same run and forecast share a single download.
+
+    Args:
+        run (datetime): The desired model run date and time.
+        forecast (int): The forecast hour.
+
+    Returns:
+        ParsedGribIndex: The parsed contents of the idx file.
+    """
+    cache_key = (run, forecast)
+    now = time.monotonic()
+    entry = _parsed_index_cache.get(cache_key)
+    if entry is not None and entry[0] > now:
+        task = entry[1]
+    else:
+        _evict_expired_indices(now)
+        task = _cache_parsed_index_task(
+            cache_key, _fetch_parsed_grib_index(run=run, forecast=forecast)
+        )
+
+    # Shield the shared task so one cancelled caller doesn't cancel the others.
+    return await asyncio.shield(task)
+
+
+async def get_parsed_grib_indices(
+    run: datetime, forecasts: List[int]
+) -> List[Optional[ParsedGribIndex]]:
+    """Returns the parsed grib idx files for several forecasts of a model run.
+
+    Forecasts that aren't already cached are fetched in one batch: their idx files are
+    downloaded concurrently and parsed in worker threads. The results fill the same
+    caches as get_parsed_grib_index, so later lookups for these forecasts don't
+    download again. An idx file that can't be fetched or parsed, e.g. because the
+    forecast hour doesn't exist, is logged and returned as None.
+
+    Args:
+        run (datetime): The desired model run date and time.
+        forecasts (List[int]): The forecast hours.
+
+    Returns:
+        List[Optional[ParsedGribIndex]]: The parsed contents of each idx file, in order.
+    """
+    now = time.monotonic()
+    _evict_expired_indices(now)
+    uncached = [
+        forecast
+        for forecast in dict.fromkeys(forecasts)
+        if (run, forecast) not in _parsed_index_cache
+    ]
+    if uncached:
+        bulk = asyncio.ensure_future(
+            _fetch_parsed_grib_indices(run=run, forecasts=uncached)
+        )
+        for position, forecast in enumerate(uncached):
+            _cache_parsed_index_task(
+                (run, forecast), _select_parsed_grib_index(bulk, position)
+            )
+
+    # Take the tasks before awaiting, since failed ones are evicted as they finish.
+    tasks = [_parsed_index_cache[(run, forecast)][1] for forecast in forecasts]
+    results = await asyncio.gather(
+        *[asyncio.shield(task) for task in tasks], return_exceptions=True
+    )
+    parsed_indices: List[Optional[ParsedGribIndex]] = []
+    for forecast, result in zip(forecasts, results):
+        if isinstance(result, BaseException):
+            logging.warning(
+                "Unable to fetch idx file for forecast hour %s: %r", forecast, result
+            )
+            result = None
+        parsed_indices.append(result)
+    return parsed_indices
+
+
 def get_param_levels_from_index(index: str) -> Dict[str, List[str]]:
     """Returns a dictionary of parameters and their available levels from idx data.
 
@@ -73,36 +522,38 @@ def get_param_levels_from_index(index: str) -> Dict[str, List[str]]:
     Returns:
         Dict[str, List[str]]: Dictionary containing parameters with available levels.
     """
-    parsed_index = parse_grib_index(index)
-    result = {}
-    for parameter, level_dicts in parsed_index.items():
-        result[parameter] = [level_dict for level_dict in level_dicts]
+    result: Dict[str, List[str]] = {}
+    for parameter, level in parse_grib_index(index):
+        result.setdefault(parameter, []).append(level)
     return result
 
 
-def parse_grib_index(index: str) -> Dict[str, Dict[str, Dict[str, Optional[int]]]]:
+def parse_grib_index(index: str) -> ParsedGribIndex:
     """Parses a grib index file into a usable dictionary.
 
     Args:
         index (str): The contents of the grib index file.
 
     Returns:
-        Dict[str, Dict[str, Dict[str, Optional[int]]]]: A dictionary containing parameter, level,
-            and start/stop byte addresses.
+        ParsedGribIndex: A dictionary mapping (parameter, level) to the byte range of
+            each message.
     """
-    result = {}
-    prev_start = None
-    for line in index.split("\n")[::-1]:
-        if len(line) != 0:
-            _, start, _, parameter, level, _ = line.rstrip(":").split(":")
-            stop = prev_start - 1 if prev_start is not None else None
-            byte_locations = {"start": int(start), "stop": stop}
-            if parameter in result.keys():
-                result[parameter][level] = byte_locations
-            else:
-                result[parameter] = {level: byte_locations}
-
-            prev_start = int(start)
+    result: ParsedGribIndex = {}
+    key: Optional[Tuple[str, str]] = None
+    start = 0
+    for line in index.splitlines():
+        if line:
+            _, start_byte, _, parameter, level, _ = line.split(":", 5)
+            next_start = int(start_byte)
+            # Each message ends where the next one starts, so close the previous one.
+            # Keep the first message when a parameter and level appear more than once.
+            if key is not None and key not in result:
+                result[key] = ByteRange(start, next_start - 1)
+            key = (parameter, level)
+            start = next_start
+    # The last message runs to the end of the file.
+    if key is not None and key not in result:
+        result[key] = ByteRange(start, None)
     return result
 
 
@@ -120,31 +571,150 @@ async def get_start_stop_byte_nums(
     Returns:
         Optional[tuple[Optional[int], Optional[int]]]: A tuple of start and stop byte nums.
     """
-    index = await get_grib_index(run=run, forecast=forecast)
-    parsed_index = parse_grib_index(index)
-    if grib_index_key := GFSParameters.get_grib_index_key(parameter=parameter):
-
-        param_dict = parsed_index.get(grib_index_key)
-        if param_dict is not None:
-            start_and_stop = param_dict.get(level)
-            if start_and_stop is not None:
-                start_byte = start_and_stop["start"]
-                stop_byte = start_and_stop["stop"]
-                return start_byte, stop_byte
-            else:
-                logging.warning("Level: %s is not in grib index.", level)
-                return (None, None)
+    parsed_index = await get_parsed_grib_index(run=run, forecast=forecast)
+    if grib_index_key := _GRIB_INDEX_KEYS.get(parameter):
+
+        byte_range = parsed_index.get((grib_index_key, level))
+        if byte_range is not None:
+            return byte_range
         else:
-            logging.warning("Param: %s is not in grib index.", grib_index_key)
+            logging.warning(
+                "Param: %s at level: %s is not in grib index.", grib_index_key, level
+            )
             return (None, None)
     else:
         logging.warning("Unable to find grib index key for param: %s", parameter)
         return (None, None)
 
 
+def _split_byte_range(
+    start: int, stop: Optional[int]
+) -> List[Tuple[int, Optional[int]]]:
+    """Splits an inclusive byte range into parts of at most RANGE_PART_SIZE bytes.
+
+    Parts after the first start on multiples of RANGE_PART_SIZE, so they line up with
+    the object's multipart upload parts on S3 and don't straddle them. A first part
+    shorter than RANGE_PART_MIN_SIZE is merged into the second, so it always holds the
+    GRIB magic and isn't a request of its own.
+
+    Args:
+        start (int): The first byte of the range.
+        stop (Optional[int]): The last byte of the range, or None for end of file.
+
+    Returns:
+        List[Tuple[int, Optional[int]]]: The inclusive (start, stop) byte range of each part.
+    """
+    if stop is None or stop - start < RANGE_PART_SIZE:
+        return [(start, stop)]
+    aligned_start = start - start % RANGE_PART_SIZE
+    parts: List[Tuple[int, Optional[int]]] = [
+        (max(part_start, start), min(part_start + RANGE_PART_SIZE - 1, stop))
+        for part_start in range(aligned_start, stop + 1, RANGE_PART_SIZE)
+    ]
+    if aligned_start + RANGE_PART_SIZE - start < RANGE_PART_MIN_SIZE:
+        parts[:2] = [(start, parts[1][1])]
+    return parts
+
+
+async def _read_response(
+    response: aiohttp.ClientResponse, prefix: bytes = b""
+) -> Optional[bytearray]:
+    """Streams a response body into a buffer preallocated from its Content-Length.
+
+    Args:
+        response (aiohttp.ClientResponse): The response to read.
+        prefix (bytes, optional): Bytes the body must start with. Defaults to b"".
+
+    Returns:
+        Optional[bytearray]: The response body, or None if it doesn't start with prefix.
+    """
+    size = int(response.headers.get("Content-Length", 0))
+    buffer = bytearray(size)
+    offset = 0
+    unchecked = bool(prefix)
+    async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+        end = offset + len(chunk)
+        buffer[offset:end] = chunk
+        offset = end
+        # Stop as soon as the start of the body is known to be wrong.
+        if unchecked and offset >= len(prefix):
+            if not buffer.startswith(prefix):
+                return None
+            unchecked = False
+    # Trim in case the body was shorter than advertised or had no Content-Length.
+    del buffer[offset:]
+    return buffer if buffer.startswith(prefix) else None
+
+
+async def _read_response_into(
+    response: aiohttp.ClientResponse, buffer: memoryview, prefix: bytes = b""
+) -> bool:
+    """Streams a response body into a buffer of exactly the expected size.
+
+    Args:
+        response (aiohttp.ClientResponse): The response to read.
+        buffer (memoryview): Where to write the body.
+        prefix (bytes, optional): Bytes the body must start with. Defaults to b"".
+
+    Returns:
+        bool: True if the body filled the buffer exactly and starts with prefix.
+    """
+    offset = 0
+    async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+        end = offset + len(chunk)
+        if end > len(buffer):
+            return False
+        buffer[offset:end] = chunk
+        # Stop as soon as the start of the body is known to be wrong.
+        if offset < len(prefix) <= end and buffer[: len(prefix)] != prefix:
+            return False
+        offset = end
+    return offset == len(buffer) and buffer[: len(prefix)] == prefix
+
+
+async def _get_byte_range(
+    session: aiohttp.ClientSession,
+    url: str,
+    start: int,
+    stop: Optional[int],
+    prefix: bytes = b"",
+    buffer: Optional[memoryview] = None,
+) -> Union[bytearray, memoryview, None]:
+    """Fetches an inclusive byte range of a remote file.
+
+    Args:
+        session (aiohttp.ClientSession): The session to request with.
+        url (str): The URL of the file.
+        start (int): The first byte of the range.
+        stop (Optional[int]): The last byte of the range, or None for end of file.
+        prefix (bytes, optional): Bytes the range must start with. Defaults to b"".
+        buffer (Optional[memoryview], optional): Where to write the range, sized to
+            hold exactly its bytes. Defaults to a new buffer.
+
+    Returns:
+        Union[bytearray, memoryview, None]: The requested bytes, or None if the server
+            didn't return a partial response or the bytes don't start with prefix.
+    """
+    # The last message in a file has no stop byte, so request through to the end.
+    byte_range = f"{start}-{stop if stop is not None else ''}"
+    async with session.get(url, headers={"Range": f"bytes={byte_range}"}) as response:
+        # Anything but 206 means the Range header was ignored, and the body is the
+        # whole file rather than the requested bytes.
+        if response.status != 206:
+            logging.warning(
+                "Range %s of %s returned status %s.", byte_range, url, response.status
+            )
+            return None
+        if buffer is None:
+            return await _read_response(response, prefix=prefix)
+        if await _read_response_into(response, buffer, prefix=prefix):
+            return buffer
+        return None
+
+
 async def get_grib_message(
     run: datetime, forecast: int, parameter: str, level: str
-) -> Optional[bytes]:
+) -> Optional[bytearray]:
     """Returns a raw GRIB message for the specified run, forecsst, parameter, and level.
 
     Args:
@@ -154,75 +724,383 @@ async def get_grib_message(
         level (str): The requested level.
 
     Returns:
-        Optional[bytes]: A raw GRIB message.
+        Optional[bytearray]: A raw GRIB message.
     """
     url = get_grib_url(run=run, forecast=forecast)
     bytes_start, bytes_stop = await get_start_stop_byte_nums(
         run=run, forecast=forecast, parameter=parameter, level=level
     )
-    headers = {"Range": f"bytes={bytes_start}-{bytes_stop}"}
     if bytes_start is not None:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url=url) as response:
-                grib_message = await response.read()
-                assert grib_message[:4] == b"GRIB"
-                return grib_message
+        session = await _get_session()
+        grib_message: Optional[bytearray]
+        if bytes_stop is None:
+            grib_message = await _get_byte_range(
+                session=session,
+                url=url,
+                start=bytes_start,
+                stop=bytes_stop,
+                prefix=GRIB_MAGIC,
+            )
+        else:
+            # The size is known, so every part streams straight into its slice of one
+            # buffer and the message is never copied.
+            grib_message = bytearray(bytes_stop - bytes_start + 1)
+            view = memoryview(grib_message)
+            part_requests = []
+            for start, stop in _split_byte_range(start=bytes_start, stop=bytes_stop):
+                offset = start - bytes_start
+                end = stop - bytes_start + 1
+                part_requests.append(
+                    _get_byte_range(
+                        session=session,
+                        url=url,
+                        start=start,
+                        stop=stop,
+                        prefix=GRIB_MAGIC if start == bytes_start else b"",
+                        buffer=view[offset:end],
+                    )
+                )
+            parts = await asyncio.gather(*part_requests)
+            if any(part is None for part in parts):
+                grib_message = None
+        if grib_message is None:
+            logging.warning(
+                "Range %s-%s of %s is not a GRIB message.", bytes_start, bytes_stop, url
+            )
+            return None
+        if not grib_message.endswith(GRIB_END):
+            logging.warning(
+                "GRIB message at %s-%s of %s is truncated.",
+                bytes_start,
+                bytes_stop,
+                url,
+            )
+            return None
+        return grib_message
 
 
-def get_dataset_from_grib_message(grib_message: bytes) -> xr.Dataset:
-    """Returns an xarray dataset from the provided grib message.
+async def get_grib_messages(
+    run: datetime, forecast: int, requests: List[Tuple[str, str]]
+) -> List[Optional[bytearray]]:
+    """Returns raw GRIB messages for several parameters and levels of one forecast.
+
+    The idx file is downloaded once and the messages are fetched concurrently. A
+    message that can't be fetched, e.g. because the forecast hour doesn't exist or the
+    server returned an error, is logged and returned as None.
 
     Args:
-        grib_message (bytes): A valid GRIB message.
+        run (datetime): Datetime of the model run.
+        forecast (int): The forecast hour.
+        requests (List[Tuple[str, str]]): The requested (parameter, level) pairs.
+
+    Returns:
+        List[Optional[bytearray]]: A raw GRIB message for each request, in order.
+    """
+    results = await asyncio.gather(
+        *[
+            get_grib_message(
+                run=run, forecast=forecast, parameter=parameter, level=level
+            )
+            for parameter, level in requests
+        ],
+        return_exceptions=True,
+    )
+    messages: List[Optional[bytearray]] = []
+    for (parameter, level), result in zip(requests, results):
+        if isinstance(result, Exception):
+            logging.warning(
+                "Unable to fetch %s at %s for forecast hour %s: %r",
+                parameter,
+                level,
+                forecast,
+                result,
+            )
+            result = None
+        messages.append(result)
+    return messages
+
+
+def _open_grib_bytes(
+    grib_message: Union[bytes, bytearray],
+    backend_kwargs: Optional[Dict[str, Any]] = None,
+) -> xr.Dataset:
+    """Decodes a GRIB message held in memory into a fully loaded xarray dataset.
+
+    cfgrib can only read from a path, so the message is staged in GRIB_TEMP_DIR, which
+    is memory backed where available.
+
+    Args:
+        grib_message (Union[bytes, bytearray]): A valid GRIB message.
+        backend_kwargs (Optional[Dict[str, Any]], optional): Extra cfgrib options.
+            Defaults to None.
 
     Returns:
         xr.Dataset: An xarray dataset.
     """
-    with NamedTemporaryFile(mode="wb") as file:
+    with NamedTemporaryFile(mode="wb", dir=GRIB_TEMP_DIR) as file:
         file.write(grib_message)
-        return xr.open_dataset(file.name, engine="cfgrib")
+        file.flush()
+        # Skip cfgrib's sidecar .idx file, which would otherwise be left behind.
+        with xr.open_dataset(
+            file.name,
+            engine="cfgrib",
+            backend_kwargs={"indexpath": "", **(backend_kwargs or {})},
+        ) as ds:
+            # Load before the temporary file is removed.
+            return ds.load()
 
 
-async def get_parameter_value(
+def get_dataset_from_grib_message(grib_message: Union[bytes, bytearray]) -> xr.Dataset:
+    """Returns an xarray dataset from the provided grib message.
+
+    Args:
+        grib_message (Union[bytes, bytearray]): A valid GRIB message.
+
+    Returns:
+        xr.Dataset: An xarray dataset.
+    """
+    return _open_grib_bytes(grib_message)
+
+
+def _interp_grid(
+    values: np.ndarray,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    latitudes: ArrayLike,
+    longitudes: ArrayLike,
+    interp_method: InterpMethod = "linear",
+) -> np.ndarray:
+    """Interpolates a regular global lat/lon grid to the requested points.
+
+    Args:
+        values (np.ndarray): Gridded values with dimensions (latitude, longitude).
+        lats (np.ndarray): The evenly spaced grid latitudes, ascending or descending.
+        lons (np.ndarray): The evenly spaced grid longitudes, starting at 0.
+        latitudes (ArrayLike): The requested latitudes.
+        longitudes (ArrayLike): The requested longitudes.
+        interp_method (InterpMethod, optional): Method to use for Interpolation. Defaults to "linear".
+
+    Raises:
+        ValueError: If the interpolation method is not supported.
+
+    Returns:
+        np.ndarray: The interpolated value at each point.
+    """
+    if (order := INTERP_ORDERS.get(interp_method)) is None:
+        raise ValueError(f"Unsupported interpolation method: {interp_method}")
+
+    # Convert coordinates to fractional grid indices. Latitudes are clamped to the
+    # grid, and longitudes wrap around the 0/360 seam.
+    i = np.clip(
+        (np.atleast_1d(latitudes) - lats[0]) / (lats[1] - lats[0]), 0, len(lats) - 1
+    )
+    j = (normalize_lon(np.atleast_1d(longitudes)) - lons[0]) / (lons[1] - lons[0])
+    j = j % len(lons)
+
+    # Only longitude is periodic, so the spline prefilter wraps along that axis alone;
+    # wrapping latitude too would blend the north pole rows into the south pole rows.
+    values = np.asarray(values, dtype=np.float64)
+    if order > 1:
+        values = spline_filter1d(values, order=order, axis=0, mode="mirror")
+        values = spline_filter1d(values, order=order, axis=1, mode="grid-wrap")
+    # Wrapped columns on both sides cover every point the kernel reaches past the seam.
+    pad = max(order, 1)
+    values = np.pad(values, ((0, 0), (pad, pad)), mode="wrap")
+    return map_coordinates(
+        values, np.vstack([i, j + pad]), order=order, mode="mirror", prefilter=False
+    )
+
+
+def _decode_and_interp(
+    grib_message: Union[bytes, bytearray],
+    grib_dataset_key: str,
+    latitudes: ArrayLike,
+    longitudes: ArrayLike,
+    interp_method: InterpMethod,
+) -> np.ndarray:
+    """Decodes a GRIB message and interpolates one of its variables to the given points.
+
+    Args:
+        grib_message (Union[bytes, bytearray]): A valid GRIB message.
+        grib_dataset_key (str): The name of the variable in the decoded dataset.
+        latitudes (ArrayLike): The requested latitudes.
+        longitudes (ArrayLike): The requested longitudes.
+        interp_method (InterpMethod): Method to use for Interpolation.
+
+    Returns:
+        np.ndarray: The interpolated value at each point.
+    """
+    # Only the named field and its lat/lon grid are needed, so skip decoding the time
+    # and vertical coordinates.
+    ds = _open_grib_bytes(
+        grib_message,
+        backend_kwargs={
+            "encode_cf": ("parameter", "geography"),
+            "filter_by_keys": {"cfVarName": grib_dataset_key},
+        },
+    )
+    return _interp_grid(
+        values=ds[grib_dataset_key].values,
+        lats=ds["latitude"].values,
+        lons=ds["longitude"].values,
+        latitudes=latitudes,
+        longitudes=longitudes,
+        interp_method=interp_method,
+    )
+
+
+async def _interp_grib_message(
+    grib_message: Optional[bytearray],
+    parameter: str,
+    coords: List[Coords],
+    interp_method: InterpMethod,
+) -> Optional[np.ndarray]:
+    """Decodes a GRIB message in a worker thread and interpolates it to each location.
+
+    Args:
+        grib_message (Optional[bytearray]): A valid GRIB message, or None if none was
+            found.
+        parameter (str): The weather parameter contained in the message.
+        coords (List[Coords]): The requested locations.
+        interp_method (InterpMethod): Method to use for Interpolation.
+
+    Returns:
+        Optional[np.ndarray]: The value of the parameter at each location.
+    """
+    if grib_message is not None:
+        if grib_dataset_key := _GRIB_DATASET_KEYS.get(parameter):
+            # Decoding blocks in ecCodes, so keep it off the event loop.
+            return await asyncio.get_running_loop().run_in_executor(
+                None,
+                _decode_and_interp,
+                grib_message,
+                grib_dataset_key,
+                [coord.latitude for coord in coords],
+                [coord.longitude for coord in coords],
+                interp_method,
+            )
+    return None
+
+
+async def get_parameter_values(
     run: datetime,
     forecast: int,
     parameter: str,
     level: str,
-    coords: Coords,
-    interp_method: InterpOptions = "linear",
+    coords: List[Coords],
+    interp_method: InterpMethod = "linear",
 ) -> Optional[np.ndarray]:
-    """Returns the value of a specific weather parameter at a provided location and time.
+    """Returns the values of a specific weather parameter at several locations.
+
+    The GRIB message is fetched and decoded once, and all locations are interpolated
+    together.
 
     Args:
-        parameter (Parameter): The requested weather parameter.
-        coords (Coords): The requested location.
-        valid_time (datetime): The requested time.
-        method (InterpOptions, optional): Method to use for Interpolation. Defaults to "linear".
+        run (datetime): Datetime of the model run.
+        forecast (int): The forecast hour.
+        parameter (str): The requested weather parameter.
+        level (str): The requested level.
+        coords (List[Coords]): The requested locations.
+        interp_method (InterpMethod, optional): Method to use for Interpolation. Defaults to "linear".
 
     Returns:
-        ArrayLike: The value of the requested weather parameter
+        Optional[np.ndarray]: The value of the requested weather parameter at each location.
     """
     grib_message = await get_grib_message(
         run=run, forecast=forecast, parameter=parameter, level=level
     )
-    if grib_message is not None:
-        with NamedTemporaryFile(mode="wb") as file:
-            file.write(grib_message)
-            ds = xr.open_dataset(file.name, engine="cfgrib")
-            if grib_dataset_key := GFSParameters.get_grib_dataset_key(parameter):
-                value = (
-                    ds[
-                        grib_dataset_key
-                    ]  # TODO - Need to add translation from parameter to key
-                    .interp(
-                        latitude=coords.latitude,
-                        longitude=coords.longitude,
-                        method=interp_method,
-                    )
-                    .data
-                )
+    return await _interp_grib_message(
+        grib_message=grib_message,
+        parameter=parameter,
+        coords=coords,
+        interp_method=interp_method,
+    )
+
+
+async def get_forecast_values(
+    run: datetime,
+    forecast: int,
+    requests: List[Tuple[str, str]],
+    coords: List[Coords],
+    interp_method: InterpMethod = "linear",
+) -> List[Optional[np.ndarray]]:
+    """Returns the values of several parameters and levels of one forecast.
 
-                return value
+    The idx file is downloaded once, and each message is fetched and decoded once for
+    all locations.
+
+    Args:
+        run (datetime): Datetime of the model run.
+        forecast (int): The forecast hour.
+        requests (List[Tuple[str, str]]): The requested (parameter, level) pairs.
+        coords (List[Coords]): The requested locations.
+        interp_method (InterpMethod, optional): Method to use for Interpolation. Defaults to "linear".
+
+    Returns:
+        List[Optional[np.ndarray]]: The value at each location for each request, in
+            order, or None where the message couldn't be fetched or decoded.
+    """
+    grib_messages = await get_grib_messages(
+        run=run, forecast=forecast, requests=requests
+    )
+    results = await asyncio.gather(
+        *[
+            _interp_grib_message(
+                grib_message=grib_message,
+                parameter=parameter,
+                coords=coords,
+                interp_method=interp_method,
+            )
+            for (parameter, _), grib_message in zip(requests, grib_messages)
+        ],
+        return_exceptions=True,
+    )
+    values: List[Optional[np.ndarray]] = []
+    for (parameter, level), result in zip(requests, results):
+        if isinstance(result, Exception):
+            logging.warning(
+                "Unable to decode %s at %s for forecast hour %s: %r",
+                parameter,
+                level,
+                forecast,
+                result,
+            )
+            result = None
+        values.append(result)
+    return values
+
+
+async def get_parameter_value(
+    run: datetime,
+    forecast: int,
+    parameter: str,
+    level: str,
+    coords: Coords,
+    interp_method: InterpMethod = "linear",
+) -> Optional[float]:
+    """Returns the value of a specific weather parameter at a provided location and time.
+
+    Args:
+        run (datetime): Datetime of the model run.
+        forecast (int): The forecast hour.
+        parameter (str): The requested weather parameter.
+        level (str): The requested level.
+        coords (Coords): The requested location.
+        interp_method (InterpMethod, optional): Method to use for Interpolation. Defaults to "linear".
+
+    Returns:
+        Optional[float]: The value of the requested weather parameter
+    """
+    values = await get_parameter_values(
+        run=run,
+        forecast=forecast,
+        parameter=parameter,
+        level=level,
+        coords=[coords],
+        interp_method=interp_method,
+    )
+    if values is not None:
+        return values[0]
 
 
 async def main():
@@ -1,6 +1,7 @@
 """A collection of commonly data models."""
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List
 
@@ -22,8 +23,11 @@ class ForecastResponseModel(BaseModel):
     forecasts: List[Forecast]
 
 
-class Coords(BaseModel):
+@dataclass(frozen=True)
+class Coords:
     """Dataclass used to store a Location."""
 
+    __slots__ = ("latitude", "longitude")
+
     latitude: float
     longitude: float
@@ -0,0 +1,112 @@
+"""Tests for main.py."""
+from typing import List, Optional
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from openwx.models import Coords
+
+PARAMETERS = ["temperature_2m", "gust_surface"]
+
+
+@pytest.fixture
+def client() -> TestClient:
+    """Provides a test client without running the app's startup tasks."""
+    return TestClient(app)
+
+
+async def get_forecast_values(
+    run, forecast: int, requests, coords: List[Coords]
+) -> List[Optional[np.ndarray]]:
+    """Mocks grib.get_forecast_values with values derived from the forecast hour."""
+    if forecast == 3:
+        return [np.array([3.5]), None]
+    return [np.array([forecast + 0.5]), np.array([10.0 * forecast])]
+
+
+@patch("openwx.grib.get_forecast_values", side_effect=get_forecast_values)
+@patch("openwx.grib.get_parsed_grib_indices", new_callable=AsyncMock)
+def test_query_grib_parameters(
+    mocked_get_parsed_grib_indices, mocked_get_forecast_values, client
+) -> None:
+    """Tests each forecast hour's values land under its own valid time."""
+    mocked_get_parsed_grib_indices.return_value = [{}, None, {}, {}]
+    response = client.get(
+        "/queryGribParameters",
+        params={
+            "run": "2022-11-12T00:00",
+            "valid_time_start": "2022-11-12T01:00",
+            "valid_time_end": "2022-11-12T04:00",
+            "latitude": 45.1,
+            "longitude": -95.94,
+            "parameter": PARAMETERS,
+        },
+    )
+    assert response.status_code == 200
+    assert [forecast["parameters"] for forecast in response.json()["forecasts"]] == [
+        {"temperature_2m": 1.5, "gust_surface": 10.0},
+        {},
+        {"temperature_2m": 3.5},
+        {"temperature_2m": 4.5, "gust_surface": 40.0},
+    ]
+    assert [forecast["valid_time"] for forecast in response.json()["forecasts"]] == [
+        f"2022-11-12T0{hour}:00:00" for hour in range(1, 5)
+    ]
+    mocked_get_parsed_grib_indices.assert_awaited_once()
+    assert mocked_get_parsed_grib_indices.call_args.kwargs["forecasts"] == [1, 2, 3, 4]
+    assert sorted(
+        call.kwargs["forecast"] for call in mocked_get_forecast_values.call_args_list
+    ) == [1, 3, 4]
+
+
+@patch("openwx.grib.get_forecast_values", side_effect=get_forecast_values)
+@patch("openwx.grib.get_parsed_grib_indices", new_callable=AsyncMock)
+def test_query_grib_parameters_timezone(
+    mocked_get_parsed_grib_indices, mocked_get_forecast_values, client
+) -> None:
+    """Tests a timezone-aware run is compared with naive valid times in UTC."""
+    mocked_get_parsed_grib_indices.return_value = [{}]
+    response = client.get(
+        "/queryGribParameters",
+        params={
+            "run": "2022-11-11T19:00-05:00",
+            "valid_time_start": "2022-11-12T01:00",
+            "valid_time_end": "2022-11-12T01:00",
+            "latitude": 45.1,
+            "longitude": -95.94,
+            "parameter": PARAMETERS,
+        },
+    )
+    assert response.status_code == 200
+    assert mocked_get_parsed_grib_indices.call_args.kwargs["forecasts"] == [1]
+
+
+@pytest.mark.parametrize(
+    "valid_time_start, parameter",
+    [
+        ("2022-11-11T23:00", "temperature_2m"),
+        ("2022-11-12T00:30", "temperature_2m"),
+        ("2022-11-12T01:00", "BOOP"),
+    ],
+)
+@patch("openwx.grib.get_parsed_grib_indices", new_callable=AsyncMock)
+def test_query_grib_parameters_invalid(
+    mocked_get_parsed_grib_indices, client, valid_time_start, parameter
+) -> None:
+    """Tests times before the run or off the hour, and unknown parameters, are 400s."""
+    response = client.get(
+        "/queryGribParameters",
+        params={
+            "run": "2022-11-12T00:00",
+            "valid_time_start": valid_time_start,
+            "valid_time_end": "2022-11-12T02:00",
+            "latitude": 45.1,
+            "longitude": -95.94,
+            "parameter": [parameter],
+        },
+    )
+    assert response.status_code == 400
+    mocked_get_parsed_grib_indices.assert_not_called()
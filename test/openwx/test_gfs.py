@@ -0,0 +1,166 @@
+"""Tests for gfs.py."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from openwx.gfs import (
+    GFSParameters,
+    _bilinear_weights,
+    clear_cache,
+    get_forecast_hours,
+    get_hours_from_range,
+    get_parameter_values,
+    normalize_lon,
+    to_naive_utc,
+)
+from openwx.models import Coords
+
+LATS = np.arange(-90, 90.25, 0.25)
+LONS = np.arange(0, 360, 0.25)
+
+
+@pytest.fixture(autouse=True)
+def clear_gfs_cache():
+    """Clears cached datasets and point values between tests."""
+    clear_cache()
+
+
+@pytest.fixture
+def gfs_dataset() -> xr.Dataset:
+    """Provides a coarse GFS-like dataset with fields linear in lat, lon, and time."""
+    lats = np.arange(-90.0, 91.0)
+    lons = np.arange(0.0, 360.0)
+    times = pd.date_range("2022-11-12 00:00", periods=4, freq="h")
+    hours = np.arange(len(times), dtype=float)
+    return xr.Dataset(
+        {
+            "tmp2m": (
+                ("time", "lat", "lon"),
+                hours[:, None, None] + lats[None, :, None] + 2 * lons[None, None, :],
+            ),
+            "gustsfc": (
+                ("time", "lat", "lon"),
+                np.broadcast_to(
+                    3 * lats[:, None] - lons[None, :],
+                    (len(times), len(lats), len(lons)),
+                ),
+            ),
+        },
+        coords={"time": times, "lat": lats, "lon": lons},
+    )
+
+
+def test_get_hours_from_range() -> None:
+    """Tests get_hours_from_range includes both endpoints at the requested interval."""
+    actual = get_hours_from_range(
+        start_time=datetime(2022, 11, 12, 0),
+        end_time=datetime(2022, 11, 12, 6),
+        interval=3,
+    )
+    expected = [
+        datetime(2022, 11, 12, 0),
+        datetime(2022, 11, 12, 3),
+        datetime(2022, 11, 12, 6),
+    ]
+    assert list(actual) == expected
+
+
+def test_get_forecast_hours() -> None:
+    """Tests get_forecast_hours counts whole days as well as hours."""
+    valid_times = get_hours_from_range(
+        start_time=datetime(2022, 11, 12, 0),
+        end_time=datetime(2022, 11, 13, 12),
+        interval=12,
+    )
+    actual = get_forecast_hours(run=datetime(2022, 11, 11, 18), valid_times=valid_times)
+    assert actual.tolist() == [6, 18, 30, 42]
+
+
+@pytest.mark.parametrize(
+    "start_time", [datetime(2022, 11, 11, 17), datetime(2022, 11, 11, 19, 30)]
+)
+def test_get_forecast_hours_invalid(start_time) -> None:
+    """Tests get_forecast_hours rejects times before the run or off the hour."""
+    valid_times = get_hours_from_range(
+        start_time=start_time, end_time=datetime(2022, 11, 12, 0)
+    )
+    with pytest.raises(ValueError):
+        get_forecast_hours(run=datetime(2022, 11, 11, 18), valid_times=valid_times)
+
+
+def test_from_string() -> None:
+    """Tests from_string returns matching metadata and None for unknown names."""
+    assert GFSParameters.from_string("temperature_2m") == GFSParameters.temperature_2m
+    assert GFSParameters.from_string("BOOP") is None
+
+
+def test_bilinear_weights() -> None:
+    """Tests _bilinear_weights returns the surrounding cell and its weights."""
+    ilat, jlons, weights = _bilinear_weights(
+        latitude=45.05, longitude=264.2, lats=LATS, lons=LONS
+    )
+    assert LATS[ilat] == 45.0
+    assert [LONS[jlon] for jlon in jlons] == [264.0, 264.25]
+    np.testing.assert_allclose(weights, [[0.16, 0.64], [0.04, 0.16]])
+
+
+def test_bilinear_weights_wraps_longitude() -> None:
+    """Tests _bilinear_weights interpolates across the prime meridian."""
+    _, jlons, weights = _bilinear_weights(
+        latitude=0.0, longitude=359.875, lats=LATS, lons=LONS
+    )
+    assert [LONS[jlon] for jlon in jlons] == [359.75, 0.0]
+    np.testing.assert_allclose(weights, [[0.5, 0.5], [0.0, 0.0]])
+
+
+def test_get_parameter_values(gfs_dataset) -> None:
+    """Tests get_parameter_values interpolates every time of a linear field."""
+    valid_times = [datetime(2022, 11, 12, 1), datetime(2022, 11, 12, 3)]
+    with patch("openwx.gfs._open_gfs", return_value=gfs_dataset) as mocked_open:
+        actual = get_parameter_values(
+            parameters=["temperature_2m", "gust_surface", "BOOP"],
+            coords=Coords(latitude=45.05, longitude=-95.8),
+            valid_times=valid_times,
+            model_run=datetime(2022, 11, 12, 0),
+        )
+    mocked_open.assert_called_once_with(model_date="20221112", model_hour="00")
+    np.testing.assert_allclose(
+        actual["temperature_2m"], [45.05 + 2 * 264.2 + 1, 45.05 + 2 * 264.2 + 3]
+    )
+    np.testing.assert_allclose(
+        actual["gust_surface"], [3 * 45.05 - 264.2, 3 * 45.05 - 264.2]
+    )
+    assert set(actual) == {"temperature_2m", "gust_surface"}
+
+
+def test_get_parameter_values_wraps_longitude(gfs_dataset) -> None:
+    """Tests get_parameter_values interpolates across the prime meridian."""
+    with patch("openwx.gfs._open_gfs", return_value=gfs_dataset):
+        actual = get_parameter_values(
+            parameters=["gust_surface"],
+            coords=Coords(latitude=0.0, longitude=-0.5),
+            valid_times=[datetime(2022, 11, 12, 0)],
+            model_run=datetime(2022, 11, 12, 0),
+        )
+    # Halfway between the 359 and 0 degree columns of a field equal to -lon.
+    np.testing.assert_allclose(actual["gust_surface"], [-179.5])
+
+
+def test_normalize_lon() -> None:
+    """Tests normalize_lon wraps longitudes into [0, 360)."""
+    assert normalize_lon(-95.94) == pytest.approx(264.06)
+    assert normalize_lon(264.06) == 264.06
+    assert normalize_lon(360.0) == 0.0
+
+
+def test_to_naive_utc() -> None:
+    """Tests to_naive_utc converts aware datetimes and leaves naive ones as UTC."""
+    eastern = timezone(timedelta(hours=-5))
+    assert to_naive_utc(datetime(2022, 11, 11, 19, tzinfo=eastern)) == datetime(
+        2022, 11, 12, 0
+    )
+    assert to_naive_utc(datetime(2022, 11, 12, 0)) == datetime(2022, 11, 12, 0)
@@ -1,16 +1,49 @@
 """Tests for grib.py."""
+import asyncio
+import os
 from datetime import datetime
-from unittest.mock import AsyncMock, patch
+from typing import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
+import numpy as np
 import pytest
+import xarray as xr
 
+from openwx import grib
 from openwx.grib import (
+    RANGE_PART_SIZE,
+    ByteRange,
+    _decode_and_interp,
+    _interp_grid,
+    _open_grib_bytes,
+    _read_response,
+    _read_response_into,
+    _split_byte_range,
+    get_forecast_values,
     get_grib_idx_url,
     get_grib_index,
+    get_grib_message,
     get_grib_url,
+    get_param_levels_from_index,
+    get_parameter_values,
+    get_parsed_grib_index,
+    get_parsed_grib_indices,
     get_start_stop_byte_nums,
     parse_grib_index,
 )
+from openwx.models import Coords
+
+# A 5 degree global 2 m temperature field equal to latitude + 0.01 * longitude.
+GRIB_FIXTURE = os.path.join(os.path.dirname(__file__), "data", "t2m_5deg.grib2")
+
+
+@pytest.fixture(autouse=True)
+def clear_parsed_index_cache(monkeypatch, tmp_path):
+    """Clears cached idx data between tests and isolates the on-disk cache."""
+    grib._parsed_index_cache.clear()
+    monkeypatch.setattr(grib, "GRIB_INDEX_CACHE_DIR", str(tmp_path / "openwx"))
+    monkeypatch.setattr(grib, "get_grib_index_etag", AsyncMock(return_value=None))
 
 
 @pytest.fixture
@@ -29,18 +62,56 @@ def test_parse_grib_index(mocked_idx_data):
     """Tests that parse_grib_index creates properly formatted dictionaries."""
     actual = parse_grib_index(index=mocked_idx_data)
     expected = {
-        "TMP": {"2 m above ground": {"start": 0, "stop": 990416}},
-        "RH": {"2 m above ground": {"start": 990417, "stop": 1068773}},
-        "GUST": {
-            "2 m above ground": {"start": 1068774, "stop": 1392290},
-            "surface": {"start": 1737623, "stop": None},
-        },
-        "RWMR": {"2 m above ground": {"start": 1392291, "stop": 1637622}},
-        "SNMR": {"2 m above ground": {"start": 1637623, "stop": 1737622}},
+        ("TMP", "2 m above ground"): ByteRange(0, 990416),
+        ("RH", "2 m above ground"): ByteRange(990417, 1068773),
+        ("GUST", "2 m above ground"): ByteRange(1068774, 1392290),
+        ("RWMR", "2 m above ground"): ByteRange(1392291, 1637622),
+        ("SNMR", "2 m above ground"): ByteRange(1637623, 1737622),
+        ("GUST", "surface"): ByteRange(1737623, None),
     }
     assert actual == expected
 
 
+def test_get_param_levels_from_index(mocked_idx_data):
+    """Tests get_param_levels_from_index lists the levels of each parameter."""
+    actual = get_param_levels_from_index(index=mocked_idx_data)
+    assert actual["GUST"] == ["2 m above ground", "surface"]
+    assert actual["TMP"] == ["2 m above ground"]
+
+
+def test_parse_grib_index_keeps_first_duplicate() -> None:
+    """Tests parse_grib_index keeps the first message for a repeated parameter/level."""
+    index = """1:0:d=2022111200:APCP:surface:0-1 hour acc fcst:
+2:100:d=2022111200:APCP:surface:0-6 hour acc fcst:
+3:250:d=2022111200:TMP:surface:1 hour fcst:
+"""
+    actual = parse_grib_index(index=index)
+    assert actual[("APCP", "surface")] == ByteRange(0, 99)
+
+
+def mock_response(
+    mocked_get: MagicMock, body: bytes, chunk_size: int, status: int = 206
+) -> None:
+    """Makes a mocked ClientSession.get stream body in chunks of chunk_size bytes.
+
+    Args:
+        mocked_get (MagicMock): A mocked ClientSession.get object.
+        body (bytes): The response body.
+        chunk_size (int): The size of each streamed chunk.
+        status (int, optional): The response status. Defaults to 206.
+    """
+
+    async def iter_chunked(_: int) -> AsyncIterator[bytes]:
+        for offset in range(0, len(body), chunk_size):
+            end = offset + chunk_size
+            yield body[offset:end]
+
+    response = mocked_get.return_value.__aenter__.return_value
+    response.status = status
+    response.headers = {"Content-Length": str(len(body))}
+    response.content.iter_chunked = iter_chunked
+
+
 @pytest.mark.asyncio
 @patch("openwx.grib.aiohttp.ClientSession.get")
 async def test_get_grib_index(mocked_get: AsyncMock) -> None:
@@ -61,6 +132,98 @@ async def test_get_grib_index(mocked_get: AsyncMock) -> None:
     )
 
 
+@pytest.mark.asyncio
+@patch("openwx.grib.get_grib_index")
+async def test_get_parsed_grib_index_shared(
+    mocked_get_grib_index, mocked_idx_data
+) -> None:
+    """Tests concurrent get_parsed_grib_index calls share one idx download."""
+    mocked_get_grib_index.return_value = mocked_idx_data
+    results = await asyncio.gather(
+        *[
+            get_parsed_grib_index(run=datetime(2022, 11, 12, 0), forecast=1)
+            for _ in range(3)
+        ]
+    )
+    assert all(result == parse_grib_index(mocked_idx_data) for result in results)
+    mocked_get_grib_index.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("openwx.grib.get_grib_index")
+async def test_get_parsed_grib_index_disk_cache(
+    mocked_get_grib_index, mocked_idx_data, monkeypatch
+) -> None:
+    """Tests parsed idx files are reused from disk when the ETag matches."""
+    monkeypatch.setattr(grib, "GRIB_INDEX_CACHE_MAX_FILES", 1)
+    grib.get_grib_index_etag.return_value = '"0123abcd-2"'
+    mocked_get_grib_index.return_value = mocked_idx_data
+    run = datetime(2022, 11, 12, 0)
+    first = await get_parsed_grib_index(run=run, forecast=1)
+    grib._parsed_index_cache.clear()
+    second = await get_parsed_grib_index(run=run, forecast=1)
+    assert first == second == parse_grib_index(mocked_idx_data)
+    assert isinstance(second[("TMP", "2 m above ground")], ByteRange)
+    mocked_get_grib_index.assert_called_once()
+
+    os.utime(os.path.join(grib.GRIB_INDEX_CACHE_DIR, "0123abcd-2.json"), (0, 0))
+    grib.get_grib_index_etag.return_value = '"4567ef"'
+    await get_parsed_grib_index(run=run, forecast=2)
+    assert sorted(os.listdir(grib.GRIB_INDEX_CACHE_DIR)) == ["4567ef.json"]
+
+
+@pytest.mark.asyncio
+@patch("openwx.grib.get_grib_index")
+async def test_get_parsed_grib_index_etag_failure(
+    mocked_get_grib_index, mocked_idx_data
+) -> None:
+    """Tests the idx file is still fetched when the ETag request fails."""
+    grib.get_grib_index_etag.side_effect = aiohttp.ClientError()
+    mocked_get_grib_index.return_value = mocked_idx_data
+    actual = await get_parsed_grib_index(run=datetime(2022, 11, 12, 0), forecast=1)
+    assert actual == parse_grib_index(mocked_idx_data)
+    assert not os.path.exists(grib.GRIB_INDEX_CACHE_DIR)
+
+
+@pytest.mark.asyncio
+@patch("openwx.grib.get_grib_index")
+async def test_get_parsed_grib_indices(mocked_get_grib_index, mocked_idx_data) -> None:
+    """Tests bulk idx fetches fill the cache and return None for missing hours."""
+
+    async def get_grib_index(run: datetime, forecast: int) -> str:
+        if forecast == 121:
+            raise aiohttp.ClientError()
+        if forecast == 3:
+            return "<html>mocked error page</html>"
+        return mocked_idx_data.replace("TMP", f"TMP{forecast}")
+
+    mocked_get_grib_index.side_effect = get_grib_index
+    run = datetime(2022, 11, 12, 0)
+    await get_parsed_grib_index(run=run, forecast=1)
+    actual = await get_parsed_grib_indices(run=run, forecasts=[1, 2, 121, 2, 3])
+    assert actual[0] == parse_grib_index(mocked_idx_data.replace("TMP", "TMP1"))
+    assert actual[1] == parse_grib_index(mocked_idx_data.replace("TMP", "TMP2"))
+    assert actual[3] == actual[1]
+    assert actual[2] is None
+    assert actual[4] is None
+    assert mocked_get_grib_index.call_count == 4
+
+    assert await get_parsed_grib_index(run=run, forecast=2) == actual[1]
+    assert mocked_get_grib_index.call_count == 4
+
+
+@pytest.mark.asyncio
+@patch("openwx.grib.get_grib_index")
+async def test_get_parsed_grib_index_missing(mocked_get_grib_index) -> None:
+    """Tests a missing idx file fails on the ETag request without a GET."""
+    grib.get_grib_index_etag.side_effect = aiohttp.ClientResponseError(
+        request_info=MagicMock(), history=(), status=404
+    )
+    with pytest.raises(aiohttp.ClientResponseError):
+        await get_parsed_grib_index(run=datetime(2022, 11, 12, 0), forecast=121)
+    mocked_get_grib_index.assert_not_called()
+
+
 def test_get_grib_url() -> None:
     """Tests get_grib_url returns a correctly formatted URL."""
     expected = "https://noaa-gfs-bdp-pds.s3.amazonaws.com/gfs.20221112/00/atmos/gfs.t00z.pgrb2.0p25.f001"
@@ -99,3 +262,340 @@ async def test_get_start_stop_byte_nums(
         run=datetime(2022, 11, 12, 0), forecast=1, parameter=parameter, level=level
     )
     assert actual == expected_result
+
+
+@pytest.mark.asyncio
+@patch("openwx.grib.get_start_stop_byte_nums")
+@patch("openwx.grib.aiohttp.ClientSession.get")
+async def test_get_grib_message(mocked_get, mocked_get_start_stop_byte_nums) -> None:
+    """Tests get_grib_message requests the byte range of the message."""
+    mocked_get_start_stop_byte_nums.return_value = (1737623, None)
+    mocked_return = b"GRIB mocked message 7777"
+    mock_response(mocked_get, mocked_return, chunk_size=5)
+    actual = await get_grib_message(
+        run=datetime(2022, 11, 12, 0),
+        forecast=1,
+        parameter="gust_surface",
+        level="surface",
+    )
+    assert actual == mocked_return
+    mocked_get.assert_called_with(
+        "https://noaa-gfs-bdp-pds.s3.amazonaws.com/gfs.20221112/00/atmos/gfs.t00z.pgrb2.0p25.f001",
+        headers={"Range": "bytes=1737623-"},
+    )
+
+
+@pytest.mark.asyncio
+@patch("openwx.grib.get_start_stop_byte_nums")
+@patch("openwx.grib.aiohttp.ClientSession.get")
+async def test_get_grib_message_split(
+    mocked_get, mocked_get_start_stop_byte_nums, monkeypatch
+) -> None:
+    """Tests get_grib_message streams split ranges into one buffer."""
+    monkeypatch.setattr(grib, "RANGE_PART_SIZE", 8)
+    monkeypatch.setattr(grib, "RANGE_PART_MIN_SIZE", 4)
+    body = b"GRIB mocked message 7777"
+    mocked_get_start_stop_byte_nums.return_value = (100, 100 + len(body) - 1)
+
+    def get(url: str, headers: dict) -> MagicMock:
+        start, stop = (int(byte) - 100 for byte in headers["Range"][6:].split("-"))
+        ranged_get = MagicMock()
+        end = stop + 1
+        mock_response(ranged_get, body[start:end], chunk_size=3)
+        return ranged_get.return_value
+
+    mocked_get.side_effect = get
+    actual = await get_grib_message(
+        run=datetime(2022, 11, 12, 0),
+        forecast=1,
+        parameter="gust_surface",
+        level="surface",
+    )
+    assert actual == body
+    assert isinstance(actual, bytearray)
+    assert mocked_get.call_count == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body", [b"<Error>mocked error page</Error>", b"GRIB mocked truncated message"]
+)
+@patch("openwx.grib.get_start_stop_byte_nums")
+@patch("openwx.grib.aiohttp.ClientSession.get")
+async def test_get_grib_message_invalid(
+    mocked_get, mocked_get_start_stop_byte_nums, body
+) -> None:
+    """Tests get_grib_message rejects bodies that aren't complete GRIB messages."""
+    mocked_get_start_stop_byte_nums.return_value = (1737623, None)
+    mock_response(mocked_get, body, chunk_size=2)
+    actual = await get_grib_message(
+        run=datetime(2022, 11, 12, 0),
+        forecast=1,
+        parameter="gust_surface",
+        level="surface",
+    )
+    assert actual is None
+
+
+@pytest.mark.asyncio
+@patch("openwx.grib.get_start_stop_byte_nums")
+@patch("openwx.grib.aiohttp.ClientSession.get")
+async def test_get_grib_message_range_ignored(
+    mocked_get, mocked_get_start_stop_byte_nums
+) -> None:
+    """Tests get_grib_message rejects a full response to a split range request."""
+    mocked_get_start_stop_byte_nums.return_value = (0, 2 * RANGE_PART_SIZE)
+    mock_response(mocked_get, b"GRIB mocked whole file 7777", chunk_size=5, status=200)
+    actual = await get_grib_message(
+        run=datetime(2022, 11, 12, 0),
+        forecast=1,
+        parameter="gust_surface",
+        level="surface",
+    )
+    assert actual is None
+
+
+def test_interp_grid() -> None:
+    """Tests _interp_grid on a descending latitude grid, including the 0/360 seam."""
+    lats = np.arange(90, -90.25, -0.25)
+    lons = np.arange(0, 360, 0.25)
+    values = lats[:, None] + np.where(lons == 0.0, 1.0, 0.0)[None, :]
+    actual = _interp_grid(
+        values=values,
+        lats=lats,
+        lons=lons,
+        latitudes=[45.1, 10.0],
+        longitudes=[-95.94, 359.875],
+    )
+    np.testing.assert_allclose(actual, [45.1, 10.5])
+
+
+def test_interp_grid_cubic_poles() -> None:
+    """Tests cubic _interp_grid doesn't wrap latitude between the poles."""
+    lats = np.arange(90, -90.25, -0.25)
+    lons = np.arange(0, 360, 0.25)
+    values = np.broadcast_to(lats[:, None], (len(lats), len(lons)))
+    actual = _interp_grid(
+        values=values,
+        lats=lats,
+        lons=lons,
+        latitudes=[89.9, -89.9, 95.0],
+        longitudes=[10.0, 10.0, 10.0],
+        interp_method="cubic",
+    )
+    np.testing.assert_allclose(actual, [89.9, -89.9, 90.0], atol=0.1)
+
+
+def test_interp_grid_cubic_seam() -> None:
+    """Tests cubic _interp_grid stays periodic across the 0/360 longitude seam."""
+    lats = np.arange(90, -90.25, -0.25)
+    lons = np.arange(0, 360, 0.25)
+    values = np.broadcast_to(np.sin(np.deg2rad(lons))[None, :], (len(lats), len(lons)))
+    longitudes = [359.9, 0.1, -0.05]
+    actual = _interp_grid(
+        values=values,
+        lats=lats,
+        lons=lons,
+        latitudes=[0.0, 0.0, 0.0],
+        longitudes=longitudes,
+        interp_method="cubic",
+    )
+    np.testing.assert_allclose(actual, np.sin(np.deg2rad(longitudes)), atol=1e-8)
+
+
+def test_interp_grid_unsupported_method() -> None:
+    """Tests _interp_grid rejects interpolation methods it cannot map to an order."""
+    with pytest.raises(ValueError):
+        _interp_grid(
+            values=np.zeros((2, 2)),
+            lats=np.array([0.0, 1.0]),
+            lons=np.array([0.0, 1.0]),
+            latitudes=0.5,
+            longitudes=0.5,
+            interp_method="quadratic",
+        )
+
+
+@pytest.mark.parametrize(
+    "start, stop, expected",
+    [
+        (100, 200, [(100, 200)]),
+        (100, None, [(100, None)]),
+        (
+            100,
+            100 + 2 * RANGE_PART_SIZE,
+            [
+                (100, RANGE_PART_SIZE - 1),
+                (RANGE_PART_SIZE, 2 * RANGE_PART_SIZE - 1),
+                (2 * RANGE_PART_SIZE, 100 + 2 * RANGE_PART_SIZE),
+            ],
+        ),
+        (
+            RANGE_PART_SIZE,
+            2 * RANGE_PART_SIZE,
+            [
+                (RANGE_PART_SIZE, 2 * RANGE_PART_SIZE - 1),
+                (2 * RANGE_PART_SIZE, 2 * RANGE_PART_SIZE),
+            ],
+        ),
+        (
+            3 * RANGE_PART_SIZE - 2,
+            4 * RANGE_PART_SIZE + 100,
+            [
+                (3 * RANGE_PART_SIZE - 2, 4 * RANGE_PART_SIZE - 1),
+                (4 * RANGE_PART_SIZE, 4 * RANGE_PART_SIZE + 100),
+            ],
+        ),
+        (
+            2 * RANGE_PART_SIZE - 2,
+            4 * RANGE_PART_SIZE,
+            [
+                (2 * RANGE_PART_SIZE - 2, 3 * RANGE_PART_SIZE - 1),
+                (3 * RANGE_PART_SIZE, 4 * RANGE_PART_SIZE - 1),
+                (4 * RANGE_PART_SIZE, 4 * RANGE_PART_SIZE),
+            ],
+        ),
+    ],
+)
+def test_split_byte_range(start, stop, expected) -> None:
+    """Tests _split_byte_range covers the whole range in bounded parts."""
+    assert _split_byte_range(start=start, stop=stop) == expected
+
+
+@pytest.mark.asyncio
+@patch("openwx.grib._open_grib_bytes")
+@patch("openwx.grib.get_grib_message")
+async def test_get_parameter_values(mocked_get_grib_message, mocked_open) -> None:
+    """Tests get_parameter_values decodes once and interpolates every location."""
+    lats = np.arange(90, -90.25, -0.25)
+    lons = np.arange(0, 360, 0.25)
+    mocked_get_grib_message.return_value = b"GRIB mocked message 7777"
+    mocked_open.return_value = xr.Dataset(
+        {"t2m": (("latitude", "longitude"), lats[:, None] + 0.01 * lons[None, :])},
+        coords={"latitude": lats, "longitude": lons},
+    )
+    actual = await get_parameter_values(
+        run=datetime(2022, 11, 12, 0),
+        forecast=1,
+        parameter="temperature_2m",
+        level="2 m above ground",
+        coords=[
+            Coords(latitude=45.1, longitude=-95.94),
+            Coords(latitude=0.0, longitude=10.0),
+        ],
+    )
+    np.testing.assert_allclose(actual, [45.1 + 2.6406, 0.1])
+    mocked_open.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [{}, {"Content-Length": "100"}])
+async def test_read_response(headers) -> None:
+    """Tests _read_response with a missing or overstated Content-Length."""
+    body = b"GRIB mocked message 7777"
+    mocked_get = MagicMock()
+    mock_response(mocked_get, body, chunk_size=7)
+    response = mocked_get.return_value.__aenter__.return_value
+    response.headers = headers
+    assert await _read_response(response) == body
+    assert await _read_response(response, prefix=b"GRIB") == body
+    assert await _read_response(response, prefix=b"GRIB2") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "size, prefix, expected",
+    [(24, b"GRIB", True), (24, b"GRIB2", False), (23, b"", False), (25, b"", False)],
+)
+async def test_read_response_into(size, prefix, expected) -> None:
+    """Tests _read_response_into only accepts a body that fills the buffer exactly."""
+    body = b"GRIB mocked message 7777"
+    mocked_get = MagicMock()
+    mock_response(mocked_get, body, chunk_size=7)
+    response = mocked_get.return_value.__aenter__.return_value
+    buffer = bytearray(size)
+    actual = await _read_response_into(response, memoryview(buffer), prefix=prefix)
+    assert actual is expected
+    if expected:
+        assert buffer == body
+
+
+@pytest.mark.asyncio
+@patch("openwx.grib._decode_and_interp")
+@patch("openwx.grib.get_grib_message")
+async def test_get_forecast_values_failures(
+    mocked_get_grib_message, mocked_decode_and_interp
+) -> None:
+    """Tests get_forecast_values returns None for requests that fail."""
+    mocked_get_grib_message.side_effect = [
+        b"GRIB temperature 7777",
+        aiohttp.ClientError(),
+        b"GRIB gust 7777",
+    ]
+
+    def decode_and_interp(grib_message, grib_dataset_key, *_) -> np.ndarray:
+        if grib_dataset_key != "t2m":
+            raise ValueError("mocked decode failure")
+        return np.array([1.0])
+
+    mocked_decode_and_interp.side_effect = decode_and_interp
+    actual = await get_forecast_values(
+        run=datetime(2022, 11, 12, 0),
+        forecast=1,
+        requests=[
+            ("temperature_2m", "2 m above ground"),
+            ("relative_humidity_2m", "2 m above ground"),
+            ("gust_surface", "surface"),
+        ],
+        coords=[Coords(latitude=45.1, longitude=-95.94)],
+    )
+    assert actual[0].tolist() == [1.0]
+    assert actual[1:] == [None, None]
+
+
+@pytest.fixture
+def grib_fixture(monkeypatch, tmp_path) -> bytes:
+    """Provides a real GRIB2 message, staged in an isolated temporary directory."""
+    pytest.importorskip("cfgrib")
+    monkeypatch.setattr(grib, "GRIB_TEMP_DIR", str(tmp_path))
+    with open(GRIB_FIXTURE, "rb") as fixture:
+        return fixture.read()
+
+
+def test_open_grib_bytes(grib_fixture, tmp_path) -> None:
+    """Tests _open_grib_bytes decodes a full dataset and leaves no files behind."""
+    ds = _open_grib_bytes(grib_fixture)
+    assert list(ds.data_vars) == ["t2m"]
+    assert ds["time"].values == np.datetime64("2022-11-12T00:00")
+    assert ds["t2m"].shape == (37, 72)
+    assert os.listdir(tmp_path) == []
+
+
+def test_decode_and_interp(grib_fixture) -> None:
+    """Tests _decode_and_interp decodes only the named field of a real GRIB message."""
+    with patch("openwx.grib.xr.open_dataset", wraps=xr.open_dataset) as spy:
+        actual = _decode_and_interp(
+            grib_message=grib_fixture,
+            grib_dataset_key="t2m",
+            latitudes=[45.1, 0.0],
+            longitudes=[-95.94, 10.0],
+            interp_method="linear",
+        )
+    np.testing.assert_allclose(actual, [45.1 + 2.6406, 0.1], atol=1e-4)
+    assert spy.call_args.kwargs["backend_kwargs"] == {
+        "indexpath": "",
+        "encode_cf": ("parameter", "geography"),
+        "filter_by_keys": {"cfVarName": "t2m"},
+    }
+
+
+def test_decode_and_interp_wrong_key(grib_fixture) -> None:
+    """Tests _decode_and_interp finds no field when the cfVarName doesn't match."""
+    with pytest.raises(KeyError):
+        _decode_and_interp(
+            grib_message=grib_fixture,
+            grib_dataset_key="gust",
+            latitudes=[0.0],
+            longitudes=[0.0],
+            interp_method="linear",
+        )